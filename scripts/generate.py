@@ -1,14 +1,27 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 import json
 import datetime
+import gzip
+import hashlib
+import heapq
 import os
+import zlib
 import xml.etree.ElementTree as ET
 import re
+from html import escape, unescape
+from io import BytesIO
+from itertools import islice
+from operator import itemgetter
+from types import SimpleNamespace
 
 # --- CONFIGURATION ---
 CISA_URL = "https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json"
+MAX_VULNS = 100  # newest KEV entries shown on the dashboard
 OUTPUT_DIR = "public"
-OUTPUT_FILE = os.path.join(OUTPUT_DIR, "index.html")
+CACHE_DIR = ".cache"
 
 # 1. VENDORS TO TRACK
 # Keys = Button Label, Values = Search Keywords (lowercase)
@@ -21,6 +34,11 @@ VENDORS = {
     'Fortinet': ['fortinet', 'fortigate'],
     'Aruba': ['aruba', 'hpe networking']
 }
+# Flattened keyword -> category: exact-name lookup first, else one pass of the compiled alternation
+VENDOR_KEYWORDS = {kw: category for category, keywords in VENDORS.items() for kw in keywords}
+VENDOR_RE = re.compile('|'.join(map(re.escape, VENDOR_KEYWORDS)))
+# Each view is rendered to its own static page (see page_name)
+VIEWS = ['All', *VENDORS, 'Other']
 
 # 2. LIFECYCLE TRACKING
 EOL_SLUGS = {
@@ -40,200 +58,260 @@ NEWS_FEEDS = [
     {"name": "Dark Reading", "url": "https://www.darkreading.com/rss.xml"}
 ]
 NEWS_TRIGGERS = ['cve-', 'zero-day', 'exploit', 'rce', 'critical', 'patch', 'vulnerability', 'backdoor']
+NEWS_RE = re.compile('|'.join(map(re.escape, NEWS_TRIGGERS)), re.IGNORECASE)
 
 # 4. STATUS SOURCES
 AZURE_STATUS_RSS = "https://azure.status.microsoft/en-gb/status/feed/"
 WINDOWS_HEALTH_RSS = "https://learn.microsoft.com/api/search/rss?search=%22known%20issue%22&locale=en-us&scopename=Windows%20Release%20Health"
 
-def fetch_cisa_data():
+# 5. NETWORK
+HTTP_TIMEOUT = (3, 8)  # (connect, read) seconds, applied to every request
+MAX_WORKERS = 16
+MAX_RETRY_AFTER = 10  # seconds; cap on honouring a server's Retry-After
+
+class _CappedRetry(Retry):
+    # Honour Retry-After on 429/503, but never let one host stall the build for long
+    def get_retry_after(self, response):
+        seconds = super().get_retry_after(response)
+        return None if seconds is None else min(seconds, MAX_RETRY_AFTER)
+
+# One pooled session shared by every fetcher (keep-alive across same-host calls)
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS,
+    # read=0: a host that accepted the connection but then timed out is not waited on twice
+    max_retries=_CappedRetry(total=2, read=0, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504])
+))
+SESSION.headers['User-Agent'] = 'MSP-Threat-Intel/1.0'
+
+def _cache_paths(url):
+    key = hashlib.sha1(url.encode()).hexdigest()
+    return os.path.join(CACHE_DIR, key + ".json"), os.path.join(CACHE_DIR, key + ".bin.gz")
+
+def _write_atomic(path, data):
+    # Write beside the target and swap it in, so an interrupted run never leaves a partial file
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f: f.write(data)
+    os.replace(tmp, path)
+
+def _cached_validators(meta_path, body_path):
+    # Conditional-GET headers from the sidecar; an unreadable entry just means a full download
+    if not os.path.exists(body_path): return {}
+    try:
+        with open(meta_path) as f: meta = json.load(f)
+    except (OSError, ValueError): return {}
+    if not isinstance(meta, dict): return {}
+    headers = {}
+    if isinstance(meta.get('etag'), str): headers['If-None-Match'] = meta['etag']
+    if isinstance(meta.get('last_modified'), str): headers['If-Modified-Since'] = meta['last_modified']
+    return headers
+
+def _get(url):
+    # Conditional GET: replay the last ETag / Last-Modified, reuse the body on 304
+    meta_path, body_path = _cache_paths(url)
     try:
-        r = requests.get(CISA_URL)
+        r = SESSION.get(url, headers=_cached_validators(meta_path, body_path), timeout=HTTP_TIMEOUT)
+        if r.status_code == 304:
+            try:
+                with open(body_path, 'rb') as f: return gzip.decompress(f.read())
+            except (OSError, EOFError, zlib.error):
+                # Cached body vanished, is truncated or corrupt: fetch it again in full
+                r = SESSION.get(url, timeout=HTTP_TIMEOUT)
         r.raise_for_status()
-        data = r.json()
+        meta = {'etag': r.headers.get('ETag'), 'last_modified': r.headers.get('Last-Modified')}
+        if meta['etag'] or meta['last_modified']:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            # Body first: a sidecar must never point at a body that isn't fully on disk
+            _write_atomic(body_path, gzip.compress(r.content, compresslevel=6))
+            _write_atomic(meta_path, json.dumps(meta).encode())
+        return r.content
+    except (requests.RequestException, OSError, EOFError, zlib.error, ValueError) as e:  # network, cache I/O, corrupt cache
+        print(f"Error fetching {url}: {e}")
+        return None
+
+def _get_all(urls):
+    # I/O-bound: fetch concurrently, results come back in input order
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        return list(pool.map(_get, urls))
+
+def fetch_cisa_data():
+    try:
+        body = _get(CISA_URL)
+        if body is None: return []
+        data = json.loads(body)
         relevant_vulns = []
         
-        for v in data.get('vulnerabilities', []):
-            vendor_field = v.get('vendorProject', '').lower()
-            
-            # --- LOGIC: Default to "Other" ---
-            assigned_vendor = "Other"
-            
-            for category, keywords in VENDORS.items():
-                if any(k in vendor_field for k in keywords):
-                    assigned_vendor = category
-                    break
+        # Only the newest MAX_VULNS are shown: pick them first (O(N log k)), then decorate just those
+        for v in heapq.nlargest(MAX_VULNS, data.get('vulnerabilities', []), key=itemgetter('dateAdded')):
+            vendor_field = (v.get('vendorProject') or '').lower()
             
-            v['ui_category'] = assigned_vendor
-            v['link'] = f"https://nvd.nist.gov/vuln/detail/{v.get('cveID')}"
+            # --- LOGIC: exact vendor name first, then keyword scan, default to "Other" ---
+            assigned_vendor = VENDOR_KEYWORDS.get(vendor_field)
+            if assigned_vendor is None:
+                m = VENDOR_RE.search(vendor_field)
+                assigned_vendor = VENDOR_KEYWORDS[m.group()] if m else "Other"
             
-            # KQL only for Microsoft
-            if assigned_vendor == 'Microsoft':
-                v['kql'] = f"DeviceTvmSoftwareVulnerabilities | where CveId == '{v.get('cveID')}' | summarize count() by DeviceName"
-            else:
-                v['kql'] = None
-            
-            relevant_vulns.append(v)
+            # Keep only what generate_html reads; the rest of the KEV record is dropped here
+            cve = v.get('cveID') or ''
+            relevant_vulns.append({
+                'cveID': cve,
+                'ui_category': assigned_vendor,
+                'dateAdded': v['dateAdded'],
+                'vulnerabilityName': v.get('vulnerabilityName') or '',
+                'shortDescription': v.get('shortDescription') or '',
+                'requiredAction': v.get('requiredAction') or '',
+                'link': f"https://nvd.nist.gov/vuln/detail/{cve}",
+                'is_ms': assigned_vendor == 'Microsoft'  # KQL only for Microsoft
+            })
             
-        return sorted(relevant_vulns, key=lambda x: x['dateAdded'], reverse=True)[:100] 
-    except Exception as e:
-        print(f"Error fetching CISA: {e}")
+        return relevant_vulns
+    except (ValueError, KeyError, TypeError, AttributeError) as e:  # bad JSON or KEV schema change
+        print(f"Error parsing CISA: {e}")
         return []
 
-def fetch_eol_data():
+def fetch_eol_data(ctx):
     items = []
-    today = datetime.date.today()
-    for friendly_name, slug in EOL_SLUGS.items():
+    jobs = list(EOL_SLUGS.items())
+    bodies = _get_all(f"https://endoflife.date/api/{slug}.json" for _, slug in jobs)
+    for (friendly_name, slug), body in zip(jobs, bodies):
+        if body is None: continue
         try:
-            r = requests.get(f"https://endoflife.date/api/{slug}.json")
-            if r.status_code != 200: continue
-            versions = r.json()[:5]
-            for v in versions:
+            versions = json.loads(body)
+            if not isinstance(versions, list):
+                print(f"EOL Error ({slug}): expected a list of cycles, got {type(versions).__name__}")
+                continue
+            # Newest cycles come first; only the top 5 per product are listed
+            for v in islice(versions, 5):
                 eol = v.get('eol')
                 if not eol or eol == False: continue
                 try:
-                    eol_dt = datetime.datetime.strptime(eol, "%Y-%m-%d").date()
-                except: continue
-                days_left = (eol_dt - today).days
-                if days_left > -730: 
+                    eol_dt = datetime.date.fromisoformat(eol)
+                except (TypeError, ValueError): continue
+                if eol_dt > ctx.cutoff:
                     status = "ok"
-                    if days_left < 0: status = "expired"
-                    elif days_left < 365: status = "warning"
+                    if eol_dt < ctx.today: status = "expired"
+                    elif eol_dt < ctx.year_ahead: status = "warning"
                     items.append({'product': f"{friendly_name} {v.get('cycle')}", 'eol': eol, 'status': status, 'sort_date': eol_dt})
-        except: continue
+        except (ValueError, TypeError, AttributeError) as e:  # bad JSON or unexpected payload shape
+            print(f"EOL Error ({slug}): {e}")
     return sorted(items, key=lambda x: x['sort_date'])
 
+def _rss_items(body, limit):
+    # Stream <item> elements as they close and stop after `limit`; the rest of the feed is never parsed
+    if body is None: return  # fetch already failed and was reported by _get
+    count = 0
+    for _, elem in ET.iterparse(BytesIO(body)):
+        if elem.tag != 'item': continue
+        yield elem
+        elem.clear()
+        count += 1
+        if count == limit: return
+
 def fetch_security_news():
     news_items = []
-    for source in NEWS_FEEDS:
+    bodies = _get_all(source['url'] for source in NEWS_FEEDS)
+    for source, body in zip(NEWS_FEEDS, bodies):
+        if body is None: continue
         try:
-            r = requests.get(source['url'], timeout=5)
-            root = ET.fromstring(r.content)
-            for item in root.findall('./channel/item')[:10]:
-                title = item.find('title').text
-                link = item.find('link').text
-                desc = item.find('description').text if item.find('description') is not None else ""
-                combined_text = (title + " " + desc).lower()
-                if any(trigger in combined_text for trigger in NEWS_TRIGGERS):
-                    news_items.append({"source": source['name'], "title": title, "link": link, "date": item.find('pubDate').text[:16] if item.find('pubDate') is not None else ""})
-        except Exception as e: continue
+            for item in _rss_items(body, 10):
+                title = item.findtext('title', '')
+                desc = item.findtext('description', '')
+                if NEWS_RE.search(title) or NEWS_RE.search(desc):
+                    news_items.append({"source": source['name'], "title": title, "link": item.findtext('link', ''), "date": item.findtext('pubDate', '')[:16]})
+        except (ET.ParseError, LookupError) as e: print(f"News RSS Error ({source['name']}): {e}")
     return news_items[:15]
 
+TAG_RE = re.compile(r'<[^>]+>')
+
+def _strip_tags(text):
+    # Status feeds ship HTML descriptions; keep the text so it can be escaped safely
+    return ' '.join(unescape(TAG_RE.sub(' ', text)).split())
+
 def fetch_status_updates():
     status_items = []
+    azure_body, windows_body = _get_all([AZURE_STATUS_RSS, WINDOWS_HEALTH_RSS])
     try:
-        r = requests.get(AZURE_STATUS_RSS, timeout=5)
-        root = ET.fromstring(r.content)
-        for item in root.findall('./channel/item')[:5]:
+        for item in _rss_items(azure_body, 5):
             status_items.append({
                 "type": "Azure Outage",
-                "title": item.find('title').text,
-                "desc": item.find('description').text,
-                "date": item.find('pubDate').text[:16],
-                "link": item.find('link').text,
+                "title": item.findtext('title', ''),
+                "desc": _strip_tags(item.findtext('description', '')),
+                "date": item.findtext('pubDate', '')[:16],
+                "link": item.findtext('link', ''),
                 "severity": "critical" 
             })
-    except Exception as e: print(f"Azure RSS Error: {e}")
+    except (ET.ParseError, LookupError) as e: print(f"Azure RSS Error: {e}")
 
     try:
-        r = requests.get(WINDOWS_HEALTH_RSS, timeout=5)
-        root = ET.fromstring(r.content)
-        for item in root.findall('./channel/item')[:10]:
-            title = item.find('title').text
+        for item in _rss_items(windows_body, 10):
+            title = item.findtext('title', '')
             if "known issue" in title.lower() or "status" in title.lower():
-                clean_desc = item.find('description').text
+                clean_desc = _strip_tags(item.findtext('description', ''))
                 if "See all messages" in clean_desc:
                     clean_desc = clean_desc.split("See all messages")[0]
                 status_items.append({
                     "type": "Windows Issue",
                     "title": title.replace(" known issues and notifications", ""), 
                     "desc": clean_desc + "...",
-                    "date": item.find('pubDate').text[:16],
-                    "link": item.find('link').text,
+                    "date": item.findtext('pubDate', '')[:16],
+                    "link": item.findtext('link', ''),
                     "severity": "warning"
                 })
-    except Exception as e: print(f"Windows RSS Error: {e}")
+    except (ET.ParseError, LookupError) as e: print(f"Windows RSS Error: {e}")
             
     return status_items
 
-def generate_html(vulns, eol, news, status):
-    # --- UI GENERATION ---
-    
-    # 1. Calculate Counts per Vendor
-    counts = {k: 0 for k in VENDORS.keys()}
-    counts['Other'] = 0
-    counts['All'] = len(vulns)
-
-    for v in vulns:
-        cat = v.get('ui_category', 'Other')
-        if cat in counts:
-            counts[cat] += 1
-        else:
-            counts['Other'] += 1
+def minify(text):
+    # Drop the indentation and blank lines left by the f-string layout.
+    # Safe for this output: there is no <pre>/<textarea>, and newlines are kept for the JS.
+    return '\n'.join(stripped for line in text.splitlines() if (stripped := line.strip()))
 
-    # 2. Build Vendor Buttons with Badges
-    vendor_buttons_html = f'<button id="btn-All" class="filter-btn active" onclick="filter(\'All\')">All Vendors <span class="count-badge">{counts["All"]}</span></button>'
-    
-    for k in VENDORS.keys():
-        count = counts.get(k, 0)
-        vendor_buttons_html += f'<button id="btn-{k}" class="filter-btn" onclick="filter(\'{k}\')">{k} <span class="count-badge">{count}</span></button>'
-    
-    # Add "Other" Button
-    vendor_buttons_html += f'<button id="btn-Other" class="filter-btn" onclick="filter(\'Other\')">Other / Misc <span class="count-badge">{counts["Other"]}</span></button>'
+CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
 
-    # 3. EOL List
-    eol_list_html = ""
-    for i in eol:
-        eol_list_html += f'''
-        <div class="eol-item st-{i["status"]}">
-            <span class="eol-prod">{i["product"]}</span>
-            <span class="eol-date">{i["eol"]}</span>
-        </div>'''
+def minify_css(css):
+    # Comments out, whitespace collapsed, no padding around punctuation or after ':'
+    css = ' '.join(CSS_COMMENT_RE.sub('', css).split())
+    css = CSS_PUNCT_RE.sub(r'\1', css).replace(': ', ':')
+    return css.replace(';}', '}')
 
-    # 4. Vulnerability Cards
-    vuln_cards_html = ""
-    for v in vulns:
-        v_cls = v['ui_category'].split()[0] if v['ui_category'] else 'Other'
-        kql = ""
-        if v.get('kql'):
-            kql = f'<div class="kql-box"><div class="kql-code">KQL: {v["kql"]}</div><button class="copy-btn" onclick="copyKql(\'{v["cveID"]}\')">Copy</button></div>'
-        
-        vuln_cards_html += f"""
-        <div class="card vendor-{v_cls}" data-vendor="{v['ui_category']}">
-            <span class="tag">{v['ui_category']}</span><span class="tag" style="float:right">{v['dateAdded']}</span>
-            <a href="{v['link']}" target="_blank" class="cve-title">{v['vulnerabilityName']} ({v['cveID']}) ↗</a>
-            <p style="font-size:0.9rem; color:#475569;">{v['shortDescription']}</p>
-            <div style="font-size:0.8rem; background:#eff6ff; padding:8px; border-radius:4px; color:#1e40af;"><strong>ACTION:</strong> {v['requiredAction']}</div>
-            {kql}
-        </div>"""
+def _encode_chunk(chunk):
+    # Exactly the bytes write_output emits for one chunk (b'' if it minifies away)
+    text = minify(chunk)
+    return (text + '\n').encode('utf-8') if text else b''
 
-    # 5. Status Items
-    status_html = ""
-    if not status: status_html = "<p>No active major outages or known issues found.</p>"
-    for s in status:
-        status_html += f"""
-        <div class="list-item status-{s['severity']}">
-            <span class="meta" style="color:{'#ef4444' if s['severity']=='critical' else '#f59e0b'}">{s['type']} • {s['date']}</span>
-            <a href="{s['link']}" target="_blank" class="item-link">{s['title']} ↗</a>
-            <div class="item-desc">{s['desc']}</div>
-        </div>"""
+def write_output(path, chunks):
+    # Stream chunks into the file and its .gz sibling in one pass. Both are written
+    # beside the target and swapped in, so a half-written file is never served.
+    tmp, gz_tmp = path + '.tmp', path + '.gz.tmp'
+    try:
+        with open(tmp, 'wb', buffering=65536) as f, gzip.open(gz_tmp, 'wb', compresslevel=6) as gz:
+            for chunk in chunks:
+                data = _encode_chunk(chunk)
+                if not data: continue
+                f.write(data)
+                gz.write(data)
+    except BaseException:
+        # Rendering or writing failed part-way: leave no stray temp files in the publish dir
+        for leftover in (tmp, gz_tmp):
+            if os.path.exists(leftover): os.remove(leftover)
+        raise
+    os.replace(tmp, path)
+    os.replace(gz_tmp, path + '.gz')
 
-    # 6. News Items
-    news_html = ""
-    for n in news:
-        news_html += f"""
-        <div class="list-item">
-            <span class="meta">{n['source']} • {n['date']}</span>
-            <a href="{n['link']}" target="_blank" class="item-link">{n['title']} ↗</a>
-        </div>"""
+def _hashed_name(stem, ext, content):
+    # The content hash in the name lets browsers/CDN cache static assets forever.
+    # Hash the bytes write_output will actually emit for `content`, not the source text.
+    return f"{stem}.{hashlib.sha1(_encode_chunk(content)).hexdigest()[:8]}.{ext}"
 
-    # --- CSS Styles ---
-    css = """
+# --- CSS Styles ---
+CSS = """
         :root { --bg: #f8fafc; --sidebar: #0f172a; --card: #ffffff; --text: #334155; --accent: #2563eb; }
         body { font-family: 'Segoe UI', system-ui, sans-serif; margin: 0; padding: 0; background: var(--bg); color: var(--text); display: flex; min-height: 100vh; }
         .sidebar { width: 340px; background: var(--sidebar); color: #e2e8f0; padding: 2rem; position: fixed; height: 100%; overflow-y: auto; flex-shrink: 0; box-sizing: border-box; }
         .sidebar h1 { font-size: 1.2rem; text-transform: uppercase; letter-spacing: 1px; margin-bottom: 2rem; border-bottom: 1px solid #334155; padding-bottom: 1rem; color: white; }
         
-        .filter-btn { display: block; width: 100%; padding: 10px; margin-bottom: 5px; background: #1e293b; border: 1px solid #334155; color: #cbd5e1; text-align: left; cursor: pointer; border-radius: 6px; transition: 0.2s; position: relative; }
+        .filter-btn { display: block; width: 100%; box-sizing: border-box; padding: 10px; margin-bottom: 5px; background: #1e293b; border: 1px solid #334155; color: #cbd5e1; text-align: left; text-decoration: none; cursor: pointer; border-radius: 6px; transition: 0.2s; position: relative; }
         .filter-btn:hover, .filter-btn.active { background: var(--accent); color: white; border-color: var(--accent); }
         
         /* NEW: Badge Style */
@@ -279,45 +357,84 @@ def generate_html(vulns, eol, news, status):
             .sidebar { width: auto; position: relative; height: auto; padding: 1rem; } 
             .main { margin: 0; padding: 1rem; } 
         }
-    """
+"""
+# Minified once: the asset name is hashed from exactly the stylesheet that gets written
+CSS_MIN = minify_css(CSS)
+CSS_FILE = _hashed_name("style", "css", CSS_MIN)
+
+# --- Client Script ---
+JS = """
+    function switchTab(tabId) {
+        document.querySelectorAll('.tab-content').forEach(t => t.classList.remove('active'));
+        document.querySelectorAll('.tab-btn').forEach(b => b.classList.remove('active'));
+        document.getElementById(tabId).classList.add('active');
+        document.getElementById('tab-btn-'+tabId).classList.add('active');
+    }
+    document.addEventListener('DOMContentLoaded', () => {
+        document.querySelectorAll('.kql-box').forEach(box => {
+            const query = "DeviceTvmSoftwareVulnerabilities | where CveId == '" + box.dataset.cve + "' | summarize count() by DeviceName";
+            box.querySelector('.kql-code').textContent = 'KQL: ' + query;
+            box.querySelector('.copy-btn').onclick = () => {
+                navigator.clipboard.writeText(query);
+                alert("KQL Copied");
+            };
+        });
+    });
+"""
+JS_FILE = _hashed_name("app", "js", JS)
+
+def page_name(vendor):
+    # 'All' is the landing page; e.g. 'Palo Alto' -> palo-alto.html
+    return "index.html" if vendor == 'All' else vendor.lower().replace(' ', '-') + ".html"
+
+def generate_html(vulns, eol, news, status, ctx, active_vendor='All'):
+    # --- UI GENERATION ---
+    # Yields the page in document order so callers can stream it straight to disk
+    
+    # 1. Calculate Counts per Vendor
+    counts = {k: 0 for k in VENDORS.keys()}
+    counts['Other'] = 0
+    counts['All'] = len(vulns)
 
-    # --- FINAL HTML ASSEMBLY ---
-    html = f"""
+    for v in vulns:
+        cat = v.get('ui_category', 'Other')
+        if cat in counts:
+            counts[cat] += 1
+        else:
+            counts['Other'] += 1
+
+    yield f"""
     <!DOCTYPE html>
     <html lang="en">
     <head>
         <meta charset="UTF-8">
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>MSP Threat Intel</title>
-        <style>{css}</style>
-        <script>
-            function filter(vendor) {{
-                document.querySelectorAll('.filter-btn').forEach(b => b.classList.remove('active'));
-                document.getElementById('btn-'+vendor).classList.add('active');
-                document.querySelectorAll('.card').forEach(card => {{
-                    card.style.display = (vendor === 'All' || card.dataset.vendor === vendor) ? 'block' : 'none';
-                }});
-            }}
-            function switchTab(tabId) {{
-                document.querySelectorAll('.tab-content').forEach(t => t.classList.remove('active'));
-                document.querySelectorAll('.tab-btn').forEach(b => b.classList.remove('active'));
-                document.getElementById(tabId).classList.add('active');
-                document.getElementById('tab-btn-'+tabId).classList.add('active');
-            }}
-            function copyKql(cve) {{
-                const query = "DeviceTvmSoftwareVulnerabilities | where CveId == '" + cve + "' | summarize count() by DeviceName";
-                navigator.clipboard.writeText(query);
-                alert("KQL Copied");
-            }}
-        </script>
+        <link rel="stylesheet" href="{CSS_FILE}">
+        <script src="{JS_FILE}" defer></script>
     </head>
     <body>
         <div class="sidebar">
             <h1>MSP Threat Intel</h1>
-            <div class="section-label">VULNERABILITY FILTER</div>
-            {vendor_buttons_html}
-            <div class="section-label">LIFECYCLE TRACKER</div>
-            {eol_list_html}
+            <div class="section-label">UPDATED {ctx.now_str}</div>
+            <div class="section-label">VULNERABILITY FILTER</div>"""
+
+    # 2. Vendor Links with Badges (each view is its own page)
+    labels = {'All': 'All Vendors', 'Other': 'Other / Misc'}
+    for k in VIEWS:
+        active = ' active' if k == active_vendor else ''
+        yield f'<a href="{page_name(k)}" class="filter-btn{active}">{labels.get(k, k)} <span class="count-badge">{counts.get(k, 0)}</span></a>'
+
+    # 3. EOL List
+    yield '<div class="section-label">LIFECYCLE TRACKER</div>'
+    for i in eol:
+        yield f'''
+        <div class="eol-item st-{i["status"]}">
+            <span class="eol-prod">{escape(i["product"])}</span>
+            <span class="eol-date">{escape(i["eol"])}</span>
+        </div>'''
+
+    yield """
         </div>
         
         <div class="main">
@@ -328,34 +445,99 @@ def generate_html(vulns, eol, news, status):
             </div>
             
             <div id="vulns" class="tab-content active">
-                <div class="grid">
-                    {vuln_cards_html}
+                <div class="grid">"""
+
+    # 4. Vulnerability Cards (only the active vendor's)
+    if active_vendor != 'All':
+        vulns = [v for v in vulns if v['ui_category'] == active_vendor]
+    if not vulns: yield "<p>No actively exploited vulnerabilities listed for this vendor.</p>"
+    for v in vulns:
+        v_cls = v['ui_category'].split()[0] if v['ui_category'] else 'Other'
+        kql = ""
+        # The query text itself is built client-side from data-cve
+        if v['is_ms']:
+            kql = f'<div class="kql-box" data-cve="{escape(v["cveID"])}"><div class="kql-code"></div><button class="copy-btn">Copy</button></div>'
+        
+        yield f"""
+        <div class="card vendor-{v_cls}">
+            <span class="tag">{v['ui_category']}</span><span class="tag" style="float:right">{escape(v['dateAdded'])}</span>
+            <a href="{escape(v['link'])}" target="_blank" class="cve-title">{escape(v['vulnerabilityName'])} ({escape(v['cveID'])}) ↗</a>
+            <p style="font-size:0.9rem; color:#475569;">{escape(v['shortDescription'])}</p>
+            <div style="font-size:0.8rem; background:#eff6ff; padding:8px; border-radius:4px; color:#1e40af;"><strong>ACTION:</strong> {escape(v['requiredAction'])}</div>
+            {kql}
+        </div>"""
+
+    yield """
                 </div>
             </div>
             
             <div id="status" class="tab-content">
-                <h3>Live Service Status (Public Feeds)</h3>
-                {status_html}
+                <h3>Live Service Status (Public Feeds)</h3>"""
+
+    # 5. Status Items
+    if not status: yield "<p>No active major outages or known issues found.</p>"
+    for s in status:
+        yield f"""
+        <div class="list-item status-{s['severity']}">
+            <span class="meta" style="color:{'#ef4444' if s['severity']=='critical' else '#f59e0b'}">{s['type']} • {escape(s['date'])}</span>
+            <a href="{escape(s['link'])}" target="_blank" class="item-link">{escape(s['title'])} ↗</a>
+            <div class="item-desc">{escape(s['desc'])}</div>
+        </div>"""
+
+    yield """
             </div>
 
             <div id="news" class="tab-content">
-                <h3>Curated Security News</h3>
-                {news_html}
+                <h3>Curated Security News</h3>"""
+
+    # 6. News Items
+    for n in news:
+        yield f"""
+        <div class="list-item">
+            <span class="meta">{n['source']} • {escape(n['date'])}</span>
+            <a href="{escape(n['link'])}" target="_blank" class="item-link">{escape(n['title'])} ↗</a>
+        </div>"""
+
+    yield """
             </div>
         </div>
     </body>
     </html>
     """
-    return html
 
-if __name__ == "__main__":
+def _collect(future, label):
+    # Last line of defence: one broken source renders as empty, the rest still publish
+    try: return future.result()
+    except Exception as e:
+        print(f"{label} fetch failed: {e!r}")
+        return []
+
+def main():
     if not os.path.exists(OUTPUT_DIR): os.makedirs(OUTPUT_DIR)
+    # Read the clock once; every fetcher/renderer works from the same snapshot
+    now = datetime.datetime.now(datetime.timezone.utc)
+    ctx = SimpleNamespace(
+        today=now.date(),
+        now_str=now.strftime('%Y-%m-%d %H:%M UTC'),
+        cutoff=now.date() - datetime.timedelta(days=730),  # hide EOL dates > 2 years past
+        year_ahead=now.date() + datetime.timedelta(days=365)
+    )
     print("Fetching Data...")
-    vulns = fetch_cisa_data()
-    eol = fetch_eol_data()
-    news = fetch_security_news()
-    status = fetch_status_updates()
+    # Run the four fetchers side by side; total wall time ~ slowest single source
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        vulns_f = pool.submit(fetch_cisa_data)
+        eol_f = pool.submit(fetch_eol_data, ctx)
+        news_f = pool.submit(fetch_security_news)
+        status_f = pool.submit(fetch_status_updates)
+    vulns, eol, news, status = (_collect(f, label) for f, label in
+                                ((vulns_f, 'CISA'), (eol_f, 'EOL'), (news_f, 'News'), (status_f, 'Status')))
     
-    with open(OUTPUT_FILE, 'w') as f:
-        f.write(generate_html(vulns, eol, news, status))
+    for name, content in ((CSS_FILE, CSS_MIN), (JS_FILE, JS)):
+        asset_path = os.path.join(OUTPUT_DIR, name)
+        if not os.path.exists(asset_path): write_output(asset_path, [content])
+    for vendor in VIEWS:
+        write_output(os.path.join(OUTPUT_DIR, page_name(vendor)), generate_html(vulns, eol, news, status, ctx, vendor))
     print("Dashboard Updated.")
+
+if __name__ == "__main__":
+    main()